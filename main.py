@@ -23,6 +23,7 @@
 """
 
 import sys
+from importlib.util import find_spec
 
 
 def main() -> None:
@@ -53,7 +54,7 @@ def main() -> None:
     logger = get_logger(__name__)
     
     # 设置信号处理器（优雅退出）
-    setup_signal_handlers(cleanup_callback=_cleanup_on_exit)
+    setup_signal_handlers()
     
     try:
         logger.info("=" * 60)
@@ -69,9 +70,12 @@ def main() -> None:
             port=settings.server.port,
             reload=settings.server.debug,
             workers=settings.server.workers if not settings.server.debug else 1,
+            # 使用 uvloop 事件循环和 httptools 解析器（未安装时回退，如 Windows 无 uvloop）
+            loop="uvloop" if find_spec("uvloop") else "asyncio",
+            http="httptools" if find_spec("httptools") else "h11",
             # 日志配置（使用自定义日志系统）
             log_level="warning",  # 降低 uvicorn 日志级别，使用自定义日志
-            access_log=settings.server.debug,
+            access_log=settings.server.debug,  # 生产环境关闭访问日志
         )
         
     except KeyboardInterrupt:
@@ -87,37 +91,5 @@ def main() -> None:
         sys.exit(1)
 
 
-def _cleanup_on_exit() -> None:
-    """
-    退出时的清理回调
-    
-    在应用退出前执行必要的清理操作。
-    """
-    from src.logger import get_logger
-    logger = get_logger(__name__)
-    
-    logger.info("执行退出清理...")
-    
-    # 清理临时文件
-    try:
-        import glob
-        import os
-        import tempfile
-        
-        temp_dir = tempfile.gettempdir()
-        patterns = ["tmp*.jpg", "tmp*.png", "tmp*.jpeg"]
-        
-        for pattern in patterns:
-            for file_path in glob.glob(os.path.join(temp_dir, pattern)):
-                try:
-                    os.remove(file_path)
-                except Exception:
-                    pass
-    except Exception as e:
-        logger.warning(f"清理临时文件时发生错误: {e}")
-    
-    logger.info("清理完成")
-
-
 if __name__ == "__main__":
     main()
@@ -4,17 +4,41 @@
 提供 FastAPI 路由的依赖注入函数。
 """
 
-from typing import Generator
+from concurrent.futures import Executor
+from typing import Generator, Optional
+
+from fastapi import Depends, Request
 
 from src.services import SliderService, ArithmeticService
 
 
-def get_slider_service() -> Generator[SliderService, None, None]:
+def get_cpu_executor(request: Request) -> Optional[Executor]:
+    """
+    获取 CPU 线程池
+
+    返回应用生命周期中创建的 CPU 线程池，用于执行 OCR/OpenCV 等
+    阻塞计算，避免阻塞事件循环。
+
+    Args:
+        request: 请求对象
+
+    Returns:
+        线程池实例，未初始化时返回 None（使用事件循环默认线程池）
+    """
+    return getattr(request.app.state, "cpu_pool", None)
+
+
+def get_slider_service(
+    executor: Optional[Executor] = Depends(get_cpu_executor),
+) -> Generator[SliderService, None, None]:
     """
     获取滑块识别服务实例
 
     FastAPI 依赖注入函数，用于在路由处理函数中注入服务实例。
 
+    Args:
+        executor: CPU 线程池（依赖注入）
+
     Yields:
         SliderService 实例
 
@@ -27,7 +51,7 @@ def get_slider_service() -> Generator[SliderService, None, None]:
         >>> async def calculate(service: SliderService = Depends(get_slider_service)):
         ...     return service.calculate_distance(...)
     """
-    service = SliderService()
+    service = SliderService(executor=executor)
     try:
         yield service
     finally:
@@ -35,12 +59,17 @@ def get_slider_service() -> Generator[SliderService, None, None]:
         pass
 
 
-def get_arithmetic_service() -> Generator[ArithmeticService, None, None]:
+def get_arithmetic_service(
+    executor: Optional[Executor] = Depends(get_cpu_executor),
+) -> Generator[ArithmeticService, None, None]:
     """
     获取算术识别服务实例
 
     FastAPI 依赖注入函数，用于在路由处理函数中注入服务实例。
 
+    Args:
+        executor: CPU 线程池（依赖注入）
+
     Yields:
         ArithmeticService 实例
 
@@ -51,9 +80,9 @@ def get_arithmetic_service() -> Generator[ArithmeticService, None, None]:
         >>>
         >>> @router.post("/calc")
         >>> async def calculate(service: ArithmeticService = Depends(get_arithmetic_service)):
-        ...     return service.recognize_and_calculate(...)
+        ...     return await service.arecognize_and_calculate(...)
     """
-    service = ArithmeticService()
+    service = ArithmeticService(executor=executor)
     try:
         yield service
     finally:
@@ -8,7 +8,7 @@ from fastapi import APIRouter, Depends
 
 from src.api.deps import get_arithmetic_service
 from src.logger import get_logger
-from src.schemas import ArithmeticRequest, create_success_response
+from src.schemas import ArithmeticRequest, ArithmeticResponse, create_success_response
 from src.services import ArithmeticService
 
 
@@ -23,6 +23,7 @@ router = APIRouter()
     summary="识别算术验证码",
     description="识别算术验证码图片并计算结果，支持 URL 和 Base64 格式图片输入",
     response_description="算术计算结果",
+    response_model=ArithmeticResponse,
 )
 async def calculate_arithmetic(
     request: ArithmeticRequest,
@@ -71,8 +72,8 @@ async def calculate_arithmetic(
     """
     logger.info(f"收到算术验证码识别请求")
     
-    # 调用服务识别并计算
-    result = service.recognize_and_calculate(request.img)
+    # 异步获取图片，并在线程池中识别并计算，避免阻塞事件循环
+    result = await service.arecognize_and_calculate(request.img)
     
     # 返回成功响应
     return create_success_response(
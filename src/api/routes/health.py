@@ -4,10 +4,15 @@
 提供服务健康状态检查接口。
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 
 from src.logger import get_logger
-from src.schemas import create_response, create_service_info
+from src.schemas import (
+    HealthResponse,
+    ServiceInfoResponse,
+    create_response,
+    create_service_info,
+)
 
 
 logger = get_logger(__name__)
@@ -15,12 +20,16 @@ logger = get_logger(__name__)
 # 创建路由器
 router = APIRouter()
 
+# 健康检查响应的 ETag（响应内容固定，变更内容时需同步更新版本号）
+_HEALTH_ETAG = '"healthy-v1"'
+
 
 @router.get(
     "/",
     summary="服务信息",
     description="获取服务基本信息和可用接口列表",
     response_description="服务信息",
+    response_model=ServiceInfoResponse,
 )
 async def root():
     """
@@ -43,19 +52,34 @@ async def root():
     summary="健康检查",
     description="检查服务是否正常运行",
     response_description="健康状态",
+    response_model=HealthResponse,
 )
-async def health_check():
+async def health_check(request: Request, response: Response):
     """
     健康检查接口
     
     用于监控服务的运行状态，适用于负载均衡器或
     容器编排系统的健康检查。
     
+    客户端携带匹配的 If-None-Match 请求头时直接返回 304，
+    跳过响应体序列化。
+    
+    Args:
+        request: 请求对象
+        response: 响应对象（用于设置缓存相关响应头）
+    
     Returns:
         健康状态响应
     """
     logger.debug("收到健康检查请求")
     
+    cache_headers = {"Cache-Control": "no-cache", "ETag": _HEALTH_ETAG}
+    
+    if request.headers.get("if-none-match") == _HEALTH_ETAG:
+        return Response(status_code=304, headers=cache_headers)
+    
+    response.headers.update(cache_headers)
+    
     return create_response(
         code=200,
         data={"status": "healthy"},
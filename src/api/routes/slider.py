@@ -4,11 +4,17 @@
 提供滑块验证码识别的 API 接口。
 """
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
 from src.api.deps import get_slider_service
 from src.logger import get_logger
-from src.schemas import SliderRequest, create_success_response, create_error_response
+from src.schemas import (
+    SliderRequest,
+    SliderResponse,
+    RecommendedSizesResponse,
+    create_success_response,
+    create_error_response,
+)
 from src.services import SliderService
 
 
@@ -23,6 +29,7 @@ router = APIRouter()
     summary="计算滑块距离",
     description="计算滑块验证码的距离，支持 URL 和 Base64 格式图片输入",
     response_description="滑块距离（像素）",
+    response_model=SliderResponse,
 )
 async def calculate_distance(
     request: SliderRequest,
@@ -44,7 +51,7 @@ async def calculate_distance(
         service: 滑块识别服务实例（依赖注入）
     
     Returns:
-        标准响应，data 字段为计算出的距离（字符串格式）
+        标准响应，data 字段为计算出的距离（整数）
     
     支持的图片格式:
         - URL: https://example.com/image.jpg
@@ -74,11 +81,11 @@ async def calculate_distance(
     )
     
     # 调用服务计算距离
-    distance = service.calculate_distance(request)
+    distance = await service.calculate_distance(request)
     
-    # 返回成功响应（距离转换为字符串格式）
+    # 返回成功响应（距离为整数像素值）
     return create_success_response(
-        data=str(distance),
+        data=distance,
         description="计算成功",
     )
 
@@ -88,20 +95,29 @@ async def calculate_distance(
     summary="获取推荐尺寸",
     description="获取推荐的图片缩放尺寸配置",
     response_description="推荐的图片尺寸配置",
+    response_model=RecommendedSizesResponse,
 )
 async def get_recommended_sizes(
+    response: Response,
     service: SliderService = Depends(get_slider_service),
 ):
     """
     获取推荐的图片尺寸配置
     
     返回针对滑块识别优化的推荐图片尺寸参数。
+    配置在运行期间不变，允许客户端和中间代理缓存 60 秒。
+    
+    Args:
+        response: 响应对象（用于设置缓存响应头）
+        service: 滑块识别服务实例（依赖注入）
     
     Returns:
         推荐的图片尺寸配置
     """
     logger.debug("收到获取推荐尺寸请求")
     
+    response.headers["Cache-Control"] = "public, max-age=60"
+    
     sizes = service.get_recommended_sizes()
     
     return create_success_response(
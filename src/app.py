@@ -4,6 +4,7 @@ FastAPI 应用工厂模块
 提供 FastAPI 应用的创建和配置功能。
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
@@ -13,6 +14,7 @@ from src.api import api_router
 from src.config import settings
 from src.exceptions import register_exception_handlers
 from src.logger import get_logger, setup_logging
+from src.utils import init_http_client, close_http_client
 
 
 logger = get_logger(__name__)
@@ -33,11 +35,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     
     启动时执行:
         - 预热 OCR 引擎
-        - 初始化连接池等资源
+        - 预热算术识别 OCR 引擎
+        - 预热 OpenCV 预处理内核
+        - 初始化连接池、CPU 线程池等资源
     
     关闭时执行:
-        - 清理临时文件
-        - 关闭连接池
+        - 关闭连接池和 CPU 线程池
         - 释放资源
     """
     # ========== 启动阶段 ==========
@@ -54,6 +57,34 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except Exception as e:
         logger.warning(f"OCR 引擎预热失败（将在首次使用时初始化）: {e}")
     
+    # 预热算术识别 OCR 引擎（可选，首次调用时会自动初始化）
+    try:
+        logger.info("预热算术识别 OCR 引擎...")
+        from src.services.arithmetic import warmup as arithmetic_warmup
+        arithmetic_warmup()
+        logger.info("算术识别 OCR 引擎预热完成")
+    except Exception as e:
+        logger.warning(f"算术识别 OCR 引擎预热失败（将在首次使用时初始化）: {e}")
+    
+    # 预热 OpenCV 预处理内核（启用 numba 时触发 JIT 编译）
+    try:
+        logger.info("预热 OpenCV 预处理内核...")
+        from src.core._kernels import warmup
+        warmup()
+        logger.info("OpenCV 预处理内核预热完成")
+    except Exception as e:
+        logger.warning(f"OpenCV 预处理内核预热失败（将在首次使用时编译）: {e}")
+    
+    # 初始化 HTTP 连接池
+    await init_http_client()
+    
+    # 创建 CPU 线程池（OCR/OpenCV 在原生代码中释放 GIL，线程可并行计算）
+    app.state.cpu_pool = ThreadPoolExecutor(
+        max_workers=settings.server.cpu_workers,
+        thread_name_prefix="cpu-worker",
+    )
+    logger.info(f"CPU 线程池已创建: {settings.server.cpu_workers} 个线程")
+    
     logger.info("-" * 60)
     logger.info(f"服务地址: http://{settings.server.host}:{settings.server.port}")
     logger.info(f"API 文档: http://{settings.server.host}:{settings.server.port}/docs")
@@ -67,40 +98,13 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("应用正在关闭...")
     logger.info("=" * 60)
     
-    # 清理临时文件
-    _cleanup_temp_files()
+    # 关闭 HTTP 连接池和 CPU 线程池
+    await close_http_client()
+    app.state.cpu_pool.shutdown(wait=True)
     
     logger.info("应用已安全关闭")
 
 
-def _cleanup_temp_files() -> None:
-    """
-    清理临时文件
-    
-    在应用关闭时清理可能残留的临时文件。
-    """
-    import glob
-    import os
-    import tempfile
-    
-    temp_dir = tempfile.gettempdir()
-    patterns = ["tmp*.jpg", "tmp*.png", "tmp*.jpeg"]
-    
-    cleaned_count = 0
-    for pattern in patterns:
-        for file_path in glob.glob(os.path.join(temp_dir, pattern)):
-            try:
-                # 只删除最近创建的临时文件（避免删除其他应用的文件）
-                if os.path.getmtime(file_path) > (os.path.getctime(file_path) - 3600):
-                    os.remove(file_path)
-                    cleaned_count += 1
-            except Exception:
-                pass
-    
-    if cleaned_count > 0:
-        logger.info(f"已清理 {cleaned_count} 个临时文件")
-
-
 def create_app() -> FastAPI:
     """
     创建 FastAPI 应用实例
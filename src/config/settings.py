@@ -6,99 +6,133 @@
 
 import os
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Any, Final, Optional
 
 
-@dataclass
+# ============================================================
+# 环境变量字段工厂
+# ============================================================
+
+def _env_str(name: str, default: str) -> Any:
+    """从环境变量读取字符串字段"""
+    return field(default_factory=lambda: os.getenv(name, default))
+
+
+def _env_int(name: str, default: int) -> Any:
+    """从环境变量读取整数字段"""
+    return field(default_factory=lambda: int(os.getenv(name, default)))
+
+
+def _env_optional_int(name: str) -> Any:
+    """从环境变量读取可选整数字段，未设置或为空时为 None"""
+    def factory() -> Optional[int]:
+        value = os.getenv(name)
+        return int(value) if value else None
+    return field(default_factory=factory)
+
+
+def _env_bool(name: str, default: bool) -> Any:
+    """从环境变量读取布尔字段（仅 "true" 视为真，不区分大小写）"""
+    fallback = "true" if default else "false"
+    return field(
+        default_factory=lambda: os.getenv(name, fallback).lower() == "true"
+    )
+
+
+@dataclass(frozen=True, slots=True)
 class ServerConfig:
     """服务器配置"""
     
-    host: str = "0.0.0.0"
-    port: int = 8000
-    debug: bool = False
-    workers: int = 1
-    
-    def __post_init__(self) -> None:
-        """从环境变量加载配置"""
-        self.host = os.getenv("SERVER_HOST", self.host)
-        self.port = int(os.getenv("SERVER_PORT", self.port))
-        self.debug = os.getenv("SERVER_DEBUG", "false").lower() == "true"
-        self.workers = int(os.getenv("SERVER_WORKERS", self.workers))
+    host: str = _env_str("SERVER_HOST", "0.0.0.0")
+    port: int = _env_int("SERVER_PORT", 8000)
+    debug: bool = _env_bool("SERVER_DEBUG", False)
+    # uvicorn 工作进程数（每个进程都会加载一份模型，内存占用成倍增加）
+    workers: int = _env_int("SERVER_WORKERS", 1)
+    # 进程内 CPU 线程池大小（OCR/OpenCV 计算在线程池中执行），默认等于 CPU 核数
+    cpu_workers: int = _env_int("SERVER_CPU_WORKERS", os.cpu_count() or 1)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ImageConfig:
     """图片处理配置"""
     
     # 默认背景图宽度（像素），None 表示不缩放
-    default_big_width: Optional[int] = None
+    default_big_width: Optional[int] = _env_optional_int("IMAGE_DEFAULT_BIG_WIDTH")
     # 默认滑块图宽度（像素），None 表示不缩放
-    default_small_width: Optional[int] = None
+    default_small_width: Optional[int] = _env_optional_int("IMAGE_DEFAULT_SMALL_WIDTH")
     # 推荐的背景图宽度
     recommended_big_width: int = 340
     # 推荐的滑块图宽度
     recommended_small_width: int = 68
+    # 请求和默认配置均未指定宽度时，是否强制缩放到推荐宽度
+    # 注意：启用后返回的距离基于缩放后的图片坐标
+    force_resize: bool = _env_bool("IMAGE_FORCE_RESIZE", False)
     # 图片下载超时时间（秒）
-    download_timeout: int = 10
-    # 临时文件后缀
-    temp_bg_suffix: str = ".jpg"
-    temp_slider_suffix: str = ".png"
+    download_timeout: int = _env_int("IMAGE_DOWNLOAD_TIMEOUT", 10)
+    # 单张图片最大下载字节数，超出时中止下载
+    max_download_bytes: int = _env_int("IMAGE_MAX_DOWNLOAD_BYTES", 10 * 1024 * 1024)
+    # HTTP 连接池保持的最大空闲连接数
+    http_pool_size: int = _env_int("IMAGE_HTTP_POOL_SIZE", 64)
+
+
+@dataclass(frozen=True, slots=True)
+class OpenCVConfig:
+    """OpenCV 识别配置"""
+    
+    # 滑块图带透明通道时，是否使用 Alpha 掩码匹配灰度图（替代二值化 + 透明区域处理）
+    # 注意：匹配结果可能与默认算法不同，建议验证后再启用
+    mask_match: bool = _env_bool("OPENCV_MASK_MATCH", False)
+    # 掩码匹配时是否先在下采样图像上粗匹配，再在原图候选位置附近精确匹配
+    coarse_to_fine: bool = _env_bool("OPENCV_COARSE_TO_FINE", False)
+    # OpenCV 内部并行线程数（与 CPU 线程池叠加，默认取 CPU 核数的一半）
+    num_threads: int = _env_int("OPENCV_NUM_THREADS", max(1, (os.cpu_count() or 1) // 2))
+
+
+@dataclass(frozen=True, slots=True)
+class CacheConfig:
+    """识别结果缓存配置"""
     
-    def __post_init__(self) -> None:
-        """从环境变量加载配置"""
-        big_width = os.getenv("IMAGE_DEFAULT_BIG_WIDTH")
-        small_width = os.getenv("IMAGE_DEFAULT_SMALL_WIDTH")
-        
-        if big_width:
-            self.default_big_width = int(big_width)
-        if small_width:
-            self.default_small_width = int(small_width)
-        
-        self.download_timeout = int(os.getenv("IMAGE_DOWNLOAD_TIMEOUT", self.download_timeout))
-
-
-@dataclass
+    # 是否启用识别结果缓存
+    enabled: bool = _env_bool("CACHE_ENABLED", True)
+    # 最大缓存条目数
+    max_size: int = _env_int("CACHE_MAX_SIZE", 512)
+    # URL 图片内容缓存字节预算，0 表示禁用
+    # （同一验证码 URL 每次可能返回不同图片，默认关闭，仅在 URL 内容固定时启用）
+    content_max_bytes: int = _env_int("CACHE_CONTENT_MAX_BYTES", 0)
+
+
+@dataclass(frozen=True, slots=True)
 class LogConfig:
     """日志配置"""
     
-    level: str = "INFO"
+    level: str = field(default_factory=lambda: os.getenv("LOG_LEVEL", "INFO").upper())
     format: str = "%(asctime)s | %(levelname)-8s | %(name)s:%(funcName)s:%(lineno)d - %(message)s"
     date_format: str = "%Y-%m-%d %H:%M:%S"
     # 是否输出到文件
-    file_output: bool = False
-    file_path: str = "logs/app.log"
+    file_output: bool = _env_bool("LOG_FILE_OUTPUT", False)
+    file_path: str = _env_str("LOG_FILE_PATH", "logs/app.log")
     # 日志文件最大大小（MB）
     max_file_size: int = 10
     # 保留的日志文件数量
     backup_count: int = 5
-    
-    def __post_init__(self) -> None:
-        """从环境变量加载配置"""
-        self.level = os.getenv("LOG_LEVEL", self.level).upper()
-        self.file_output = os.getenv("LOG_FILE_OUTPUT", "false").lower() == "true"
-        self.file_path = os.getenv("LOG_FILE_PATH", self.file_path)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AppConfig:
     """应用配置"""
     
-    name: str = "滑块验证码距离计算服务"
-    version: str = "1.2.0"
+    name: str = _env_str("APP_NAME", "滑块验证码距离计算服务")
+    version: str = _env_str("APP_VERSION", "1.2.0")
     description: str = "基于 OCR 和 OpenCV 的滑块验证码距离计算 HTTP 服务"
-    
-    def __post_init__(self) -> None:
-        """从环境变量加载配置"""
-        self.name = os.getenv("APP_NAME", self.name)
-        self.version = os.getenv("APP_VERSION", self.version)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Settings:
     """
     应用程序全局配置
     
     统一管理所有配置项，支持从环境变量读取配置。
+    配置在模块导入时一次性读取，实例不可变。
     
     使用示例:
         >>> from src.config import settings
@@ -111,9 +145,11 @@ class Settings:
     app: AppConfig = field(default_factory=AppConfig)
     server: ServerConfig = field(default_factory=ServerConfig)
     image: ImageConfig = field(default_factory=ImageConfig)
+    opencv: OpenCVConfig = field(default_factory=OpenCVConfig)
+    cache: CacheConfig = field(default_factory=CacheConfig)
     log: LogConfig = field(default_factory=LogConfig)
 
 
 # 全局配置实例（单例模式）
-settings = Settings()
+settings: Final[Settings] = Settings()
 
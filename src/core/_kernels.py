@@ -0,0 +1,65 @@
+"""
+像素处理内核
+
+集中存放 OpenCV 识别使用的逐像素预处理内核。
+安装 numba 时使用 JIT 编译实现，否则回退到 NumPy 实现。
+"""
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # numba 为可选依赖，未安装时回退到 NumPy 实现
+    numba = None
+
+
+def _preprocess_slider_numpy(tpl_gray: np.ndarray) -> np.ndarray:
+    """
+    滑块图透明区域处理（NumPy 实现）
+    
+    黑色像素视为与 96 同类，保留为 96，其余像素置为 255，
+    结果与逐像素替换 + inRange 掩码处理完全一致。
+    
+    Args:
+        tpl_gray: 滑块灰度图
+    
+    Returns:
+        处理后的滑块图
+    """
+    keep = (tpl_gray == 0) | (tpl_gray == 96)
+    return np.where(keep, np.uint8(96), np.uint8(255))
+
+
+if numba is not None:
+    # 滑块图通常不足 100x100 像素，且调用方已在线程池中并行处理请求，
+    # 不启用 parallel=True，避免线程调度开销超过计算本身
+    @numba.njit(cache=True, nogil=True)
+    def preprocess_slider(tpl_gray: np.ndarray) -> np.ndarray:
+        """
+        滑块图透明区域处理（Numba JIT 实现）
+        
+        单次遍历完成替换与二值化，每个像素只读写一次。
+        
+        Args:
+            tpl_gray: 滑块灰度图
+        
+        Returns:
+            处理后的滑块图
+        """
+        tpl_flat = tpl_gray.ravel()
+        out = np.empty(tpl_flat.size, dtype=np.uint8)
+        for i in range(tpl_flat.size):
+            value = tpl_flat[i]
+            out[i] = 96 if value == 0 or value == 96 else 255
+        return out.reshape(tpl_gray.shape)
+else:
+    preprocess_slider = _preprocess_slider_numpy
+
+
+def warmup() -> None:
+    """
+    预热像素处理内核
+    
+    启用 numba 时触发 JIT 编译（或加载磁盘缓存），避免首个请求承担编译耗时。
+    """
+    preprocess_slider(np.zeros((1, 1), dtype=np.uint8))
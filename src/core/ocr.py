@@ -4,19 +4,26 @@ OCR 识别算法
 使用 ddddocr 库实现滑块验证码距离识别。
 """
 
+import threading
 from typing import Optional
 
 import ddddocr
 
+from src.config import settings
 from src.exceptions import OCRRecognitionError
 from src.logger import get_logger
-from src.utils import get_image_content, resize_image
+from src.utils import LRUCache, content_hash, resize_image
 
 
 logger = get_logger(__name__)
 
 # 全局 OCR 实例（延迟初始化，避免重复创建）
 _ocr_instance: Optional[ddddocr.DdddOcr] = None
+# 保护 OCR 实例初始化的锁（避免并发首次请求重复加载模型）
+_ocr_lock = threading.Lock()
+
+# 识别结果缓存（键为原始图片内容哈希 + 识别参数）
+_result_cache = LRUCache(max_size=settings.cache.max_size)
 
 
 def _get_ocr_instance() -> ddddocr.DdddOcr:
@@ -24,6 +31,7 @@ def _get_ocr_instance() -> ddddocr.DdddOcr:
     获取 OCR 实例（单例模式）
     
     使用延迟初始化和单例模式，避免重复创建 OCR 实例。
+    初始化过程使用双重检查锁，保证并发场景下模型只加载一次。
     
     Returns:
         ddddocr.DdddOcr 实例
@@ -31,16 +39,18 @@ def _get_ocr_instance() -> ddddocr.DdddOcr:
     global _ocr_instance
     
     if _ocr_instance is None:
-        logger.info("初始化 OCR 引擎...")
-        _ocr_instance = ddddocr.DdddOcr(det=False, ocr=False, show_ad=False)
-        logger.info("OCR 引擎初始化完成")
+        with _ocr_lock:
+            if _ocr_instance is None:
+                logger.info("初始化 OCR 引擎...")
+                _ocr_instance = ddddocr.DdddOcr(det=False, ocr=False, show_ad=False)
+                logger.info("OCR 引擎初始化完成")
     
     return _ocr_instance
 
 
 def recognize_by_ocr(
-    background_input: str,
-    slider_input: str,
+    background_image: bytes,
+    slider_image: bytes,
     big_width: Optional[int] = None,
     small_width: Optional[int] = None,
     simple_target: bool = True,
@@ -52,8 +62,8 @@ def recognize_by_ocr(
     计算滑块需要移动的像素距离。
     
     Args:
-        background_input: 背景图片（URL 或 Base64）
-        slider_input: 滑块图片（URL 或 Base64）
+        background_image: 背景图片字节内容
+        slider_image: 滑块图片字节内容
         big_width: 背景图目标宽度，None 表示不调整
         small_width: 滑块图目标宽度，None 表示不调整
         simple_target: 是否为简单目标，True 通常适用于标准滑块验证码
@@ -66,41 +76,54 @@ def recognize_by_ocr(
     
     使用示例:
         >>> distance = recognize_by_ocr(
-        ...     background_input="https://example.com/bg.jpg",
-        ...     slider_input="https://example.com/slider.png",
+        ...     background_image=get_image_content("https://example.com/bg.jpg"),
+        ...     slider_image=get_image_content("https://example.com/slider.png"),
         ...     big_width=340,
         ...     small_width=68
         ... )
         >>> print(f"滑块距离: {distance} 像素")
     
     算法说明:
-        1. 获取并处理背景图和滑块图
+        1. 根据图片内容哈希查询结果缓存，命中时直接返回
         2. 根据需要调整图片尺寸
         3. 使用 ddddocr 的 slide_match 进行模板匹配
         4. 返回匹配位置的 X 坐标
     """
     logger.info("开始 OCR 识别...")
-    logger.debug(f"参数: big_width={big_width}, small_width={small_width}, simple_target={simple_target}")
+    logger.debug(
+        "参数: big_width=%s, small_width=%s, simple_target=%s",
+        big_width,
+        small_width,
+        simple_target,
+    )
     
     try:
         # 获取 OCR 实例
         ocr = _get_ocr_instance()
         
-        # 获取图片内容
-        logger.debug("获取滑块图片内容...")
-        slider_image = get_image_content(slider_input)
-        
-        logger.debug("获取背景图片内容...")
-        background_image = get_image_content(background_input)
+        # 查询结果缓存（使用缩放前的原始内容计算哈希）
+        cache_key = None
+        if settings.cache.enabled:
+            cache_key = (
+                content_hash(background_image),
+                content_hash(slider_image),
+                big_width,
+                small_width,
+                simple_target,
+            )
+            cached = _result_cache.get(cache_key)
+            if cached is not None:
+                logger.info("OCR 识别命中缓存: 距离=%s", cached)
+                return cached
         
         # 调整图片尺寸
         if big_width is not None:
             background_image = resize_image(background_image, big_width)
-            logger.info(f"背景图已调整宽度至: {big_width}px")
+            logger.info("背景图已调整宽度至: %spx", big_width)
         
         if small_width is not None:
             slider_image = resize_image(slider_image, small_width)
-            logger.info(f"滑块图已调整宽度至: {small_width}px")
+            logger.info("滑块图已调整宽度至: %spx", small_width)
         
         # 执行 OCR 识别
         logger.debug("执行 slide_match 匹配...")
@@ -109,11 +132,14 @@ def recognize_by_ocr(
         # 提取距离
         distance = result["target"][0]
         
-        logger.info(f"OCR 识别完成: 原始结果={result}, 距离={distance}")
+        if cache_key is not None:
+            _result_cache.set(cache_key, distance)
+        
+        logger.info("OCR 识别完成: 原始结果=%s, 距离=%s", result, distance)
         return distance
         
     except Exception as e:
-        logger.error(f"OCR 识别失败: {e}")
+        logger.error("OCR 识别失败: %s", e)
         raise OCRRecognitionError(
             message="OCR 识别失败",
             details=str(e),
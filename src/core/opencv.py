@@ -4,25 +4,57 @@ OpenCV 识别算法
 使用 OpenCV 库实现滑块验证码距离识别。
 """
 
-import os
-import tempfile
 from typing import Optional
 
 import cv2
 import numpy as np
 
 from src.config import settings
+from src.core._kernels import preprocess_slider
 from src.exceptions import OpenCVRecognitionError
 from src.logger import get_logger
-from src.utils import get_image_content, resize_image
+from src.utils import LRUCache, content_hash, resize_image_array
 
 
 logger = get_logger(__name__)
 
+# 识别结果缓存（键为原始图片内容哈希 + 识别参数）
+_result_cache = LRUCache(max_size=settings.cache.max_size)
+
+# 由粗到精匹配：启用下采样的最小滑块尺寸，以及原分辨率下的精确匹配半径（像素）
+_COARSE_MIN_SIZE = 16
+_REFINE_RADIUS = 4
+
+
+def _configure_opencv() -> None:
+    """
+    配置 OpenCV 运行参数
+    
+    启用 SIMD 优化并设置内部并行线程数；
+    OpenCV 未编译并行框架时 num_threads 不生效，记录警告。
+    """
+    cv2.setUseOptimized(True)
+    cv2.setNumThreads(settings.opencv.num_threads)
+    
+    framework = ""
+    for line in cv2.getBuildInformation().splitlines():
+        key, _, value = line.partition(":")
+        if key.strip() == "Parallel framework":
+            framework = value.strip()
+            break
+    
+    if framework and framework.lower() != "none":
+        logger.debug("OpenCV 并行框架: %s | 线程数: %s", framework, cv2.getNumThreads())
+    else:
+        logger.warning("OpenCV 未启用并行框架，matchTemplate 将以单线程运行")
+
+
+_configure_opencv()
+
 
 def recognize_by_opencv(
-    background_input: str,
-    slider_input: str,
+    background_content: bytes,
+    slider_content: bytes,
     big_width: Optional[int] = None,
     small_width: Optional[int] = None,
 ) -> int:
@@ -33,8 +65,8 @@ def recognize_by_opencv(
     计算滑块需要移动的像素距离。
     
     Args:
-        background_input: 背景图片（URL 或 Base64）
-        slider_input: 滑块图片（URL 或 Base64）
+        background_content: 背景图片字节内容
+        slider_content: 滑块图片字节内容
         big_width: 背景图目标宽度，None 表示不调整
         small_width: 滑块图目标宽度，None 表示不调整
     
@@ -46,151 +78,267 @@ def recognize_by_opencv(
     
     使用示例:
         >>> distance = recognize_by_opencv(
-        ...     background_input="https://example.com/bg.jpg",
-        ...     slider_input="https://example.com/slider.png",
+        ...     background_content=get_image_content("https://example.com/bg.jpg"),
+        ...     slider_content=get_image_content("https://example.com/slider.png"),
         ...     big_width=340,
         ...     small_width=68
         ... )
         >>> print(f"滑块距离: {distance} 像素")
     
     算法说明:
-        1. 获取背景图和滑块图的字节内容
-        2. 根据需要调整图片尺寸
-        3. 将图片保存为临时文件（OpenCV 需要文件路径）
+        1. 根据图片内容哈希查询结果缓存，命中时直接返回
+        2. 直接从内存字节解码图片（无需临时文件）
+        3. 根据需要调整图片尺寸（在解码后的数组上进行，无需重新编解码）
         4. 对背景图进行灰度转换和二值化处理
-        5. 对滑块图进行预处理（透明区域处理）
+        5. 对滑块图进行预处理（透明区域处理）；
+           启用 OPENCV_MASK_MATCH 且滑块图带透明通道时，
+           改为在灰度图上使用 Alpha 掩码直接匹配
         6. 使用模板匹配算法找到最佳匹配位置
         7. 返回匹配位置的 X 坐标
     """
     logger.info("开始 OpenCV 识别...")
-    logger.debug(f"参数: big_width={big_width}, small_width={small_width}")
-    
-    bg_path: Optional[str] = None
-    slider_path: Optional[str] = None
+    logger.debug("参数: big_width=%s, small_width=%s", big_width, small_width)
     
     try:
-        # 获取图片内容
-        logger.debug("获取背景图片内容...")
-        bg_content = get_image_content(background_input)
+        # 查询结果缓存（使用缩放前的原始内容计算哈希）
+        cache_key = None
+        if settings.cache.enabled:
+            cache_key = (
+                content_hash(background_content),
+                content_hash(slider_content),
+                big_width,
+                small_width,
+            )
+            cached = _result_cache.get(cache_key)
+            if cached is not None:
+                logger.info("OpenCV 识别命中缓存: 距离=%s", cached)
+                return cached
+        
+        # 解码图片（只解码一次，后续处理均在 ndarray 上进行）
+        logger.debug("解码背景图片...")
+        img = _decode_image(background_content, "背景图")
         
-        logger.debug("获取滑块图片内容...")
-        slider_content = get_image_content(slider_input)
+        logger.debug("解码滑块图片...")
+        tpl = _decode_slider(slider_content)
         
         # 调整图片尺寸（如果指定了尺寸）
         if big_width is not None:
-            bg_content = resize_image(bg_content, big_width)
-            logger.info(f"背景图已调整宽度至: {big_width}px")
+            img = resize_image_array(img, big_width)
+            logger.info("背景图已调整宽度至: %spx", big_width)
         
         if small_width is not None:
-            slider_content = resize_image(slider_content, small_width)
-            logger.info(f"滑块图已调整宽度至: {small_width}px")
-        
-        # 保存到临时文件
-        logger.debug("创建临时文件...")
-        with tempfile.NamedTemporaryFile(
-            delete=False,
-            suffix=settings.image.temp_bg_suffix,
-        ) as bg_temp:
-            bg_temp.write(bg_content)
-            bg_path = bg_temp.name
-        
-        with tempfile.NamedTemporaryFile(
-            delete=False,
-            suffix=settings.image.temp_slider_suffix,
-        ) as slider_temp:
-            slider_temp.write(slider_content)
-            slider_path = slider_temp.name
+            tpl = resize_image_array(tpl, small_width)
+            logger.info("滑块图已调整宽度至: %spx", small_width)
         
-        logger.debug(f"临时文件: bg={bg_path}, slider={slider_path}")
+        # 缩放后再灰度化
+        # （不使用 IMREAD_GRAYSCALE 直接解码：其灰度值与 BGR 解码后转换的结果不一致，会改变识别结果）
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
         
         # 执行 OpenCV 识别
-        distance = _opencv_match(bg_path, slider_path)
+        distance = _opencv_match(img, tpl)
         
-        logger.info(f"OpenCV 识别完成: 距离={distance}")
+        if cache_key is not None:
+            _result_cache.set(cache_key, distance)
+        
+        logger.info("OpenCV 识别完成: 距离=%s", distance)
         return distance
         
     except Exception as e:
-        logger.error(f"OpenCV 识别失败: {e}")
+        logger.error("OpenCV 识别失败: %s", e)
         raise OpenCVRecognitionError(
             message="OpenCV 识别失败",
             details=str(e),
         )
-    finally:
-        # 清理临时文件
-        _cleanup_temp_files(bg_path, slider_path)
 
 
-def _opencv_match(bg_img_path: str, puzzle_image_path: str) -> int:
+def _opencv_match(img: np.ndarray, tpl: np.ndarray) -> int:
     """
     执行 OpenCV 模板匹配
     
     核心算法实现，不修改原有识别逻辑。
     
     Args:
-        bg_img_path: 背景图片路径
-        puzzle_image_path: 滑块图片路径
+        img: 背景灰度图
+        tpl: 滑块图（BGR；启用掩码匹配时可为带透明通道的 BGRA）
     
     Returns:
         匹配位置的 X 坐标
     """
-    logger.debug("读取背景图片...")
-    # 读取背景图片
-    img = cv2.imdecode(
-        np.fromfile(bg_img_path, dtype=np.uint8),
-        cv2.IMREAD_COLOR,
-    )
-    
-    logger.debug("读取滑块图片...")
-    # 读取滑块图片
-    tpl = cv2.imdecode(
-        np.fromfile(puzzle_image_path, dtype=np.uint8),
-        cv2.IMREAD_COLOR,
-    )
-    
-    # 背景图灰度化和二值化
-    logger.debug("处理背景图: 灰度化和二值化...")
-    img_gry = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    _, img_bw = cv2.threshold(img_gry, 127, 255, cv2.THRESH_BINARY)
+    if tpl.shape[2] == 4:
+        return _opencv_mask_match(img, tpl)
+    
+    # 背景图二值化
+    logger.debug("处理背景图: 二值化...")
+    _, img_bw = cv2.threshold(img, 127, 255, cv2.THRESH_BINARY)
     
     # 滑块图预处理
     logger.debug("处理滑块图: 透明区域处理...")
     tpl = cv2.cvtColor(tpl, cv2.COLOR_BGR2GRAY)
     
-    # 处理透明区域（将黑色像素替换为特定值）
-    for row in range(tpl.shape[0]):
-        for col in range(tpl.shape[1]):
-            if tpl[row, col] == 0:
-                tpl[row, col] = 96
-    
-    # 创建掩码并处理
-    lower = np.array([96])
-    upper = np.array([96])
-    mask = cv2.inRange(tpl, lower, upper)
-    tpl[mask == 0] = 0
-    tpl[mask == 0] = 255
+    tpl = preprocess_slider(tpl)
     
     # 模板匹配
+    # cv2.matchTemplate 内部基于 DFT 计算互相关（crossCorr），无需手动实现 FFT 相关；
+    # 相同背景图/滑块图的重复请求由结果缓存直接命中，不会重复匹配
     logger.debug("执行模板匹配...")
     result = cv2.matchTemplate(img_bw, tpl, cv2.TM_CCOEFF_NORMED)
     _, _, _, max_loc = cv2.minMaxLoc(result)
     
     distance = int(max_loc[0])
-    logger.debug(f"模板匹配完成: max_loc={max_loc}, distance={distance}")
+    logger.debug("模板匹配完成: max_loc=%s, distance=%s", max_loc, distance)
+    
+    return distance
+
+
+def _opencv_mask_match(img: np.ndarray, slider: np.ndarray) -> int:
+    """
+    使用 Alpha 掩码执行 OpenCV 模板匹配
+    
+    直接在灰度图上匹配，仅统计滑块不透明区域的像素，
+    省去背景图二值化和滑块图透明区域处理。
+    
+    Args:
+        img: 背景灰度图
+        slider: 带透明通道的滑块图（BGRA）
+    
+    Returns:
+        匹配位置的 X 坐标
+    """
+    logger.debug("执行 Alpha 掩码模板匹配...")
+    alpha = slider[:, :, 3]
+    rows = np.flatnonzero(alpha.any(axis=1))
+    cols = np.flatnonzero(alpha.any(axis=0))
+    if rows.size == 0:
+        raise ValueError("滑块图完全透明，无法匹配")
+    
+    # 掩码为 0 的行列不参与计算，裁掉滑块图的透明边缘，并同步裁剪背景图的搜索范围：
+    # 结果矩阵的尺寸和坐标含义不变（仍以原滑块图左上角为基准），但计算量只与不透明区域相关。
+    # 常见的与背景图等高的滑块图由此只在滑块所在的水平条带内匹配。
+    top, bottom = rows[0], rows[-1] + 1
+    left, right = cols[0], cols[-1] + 1
+    tpl_h, tpl_w = alpha.shape
+    img_h, img_w = img.shape
+    img_band = img[top:img_h - tpl_h + bottom, left:img_w - tpl_w + right]
+    
+    tpl_gry = cv2.cvtColor(slider[top:bottom, left:right], cv2.COLOR_BGRA2GRAY)
+    mask = np.where(alpha[top:bottom, left:right] > 0, np.uint8(255), np.uint8(0))
+    
+    if settings.opencv.coarse_to_fine and min(tpl_gry.shape) >= _COARSE_MIN_SIZE:
+        distance = _coarse_to_fine_match(img_band, tpl_gry, mask)
+    else:
+        distance = _masked_match_x(img_band, tpl_gry, mask)
+    
+    logger.debug("Alpha 掩码模板匹配完成: distance=%s", distance)
     
     return distance
 
 
-def _cleanup_temp_files(*file_paths: Optional[str]) -> None:
+def _coarse_to_fine_match(img: np.ndarray, tpl: np.ndarray, mask: np.ndarray) -> int:
+    """
+    由粗到精的掩码模板匹配
+    
+    先在 2 倍下采样的图像上匹配得到候选位置，
+    再在原分辨率图像的候选位置附近（±_REFINE_RADIUS 像素）精确匹配。
+    
+    Args:
+        img: 背景灰度图
+        tpl: 滑块灰度图
+        mask: 滑块掩码
+    
+    Returns:
+        匹配位置的 X 坐标
+    """
+    # 透明像素（BGRA2GRAY 后为黑色）用不透明区域均值填充，避免下采样时渗入边缘
+    tpl_filled = tpl.copy()
+    tpl_filled[mask == 0] = int(cv2.mean(tpl, mask=mask)[0])
+    # 下采样后的掩码边缘为半透明过渡值，只保留完全不透明的像素
+    coarse_mask = np.where(cv2.pyrDown(mask) == 255, np.uint8(255), np.uint8(0))
+    if not coarse_mask.any():
+        return _masked_match_x(img, tpl, mask)
+    
+    coarse_x = _masked_match_x(cv2.pyrDown(img), cv2.pyrDown(tpl_filled), coarse_mask) * 2
+    
+    x0 = max(0, coarse_x - _REFINE_RADIUS)
+    x1 = min(img.shape[1], coarse_x + tpl.shape[1] + _REFINE_RADIUS)
+    
+    return x0 + _masked_match_x(img[:, x0:x1], tpl, mask)
+
+
+def _masked_match_x(img: np.ndarray, tpl: np.ndarray, mask: np.ndarray) -> int:
+    """
+    执行掩码模板匹配并返回最佳匹配位置的 X 坐标
+    
+    Args:
+        img: 背景灰度图
+        tpl: 滑块灰度图
+        mask: 滑块掩码
+    
+    Returns:
+        匹配位置的 X 坐标
+    """
+    result = cv2.matchTemplate(img, tpl, cv2.TM_CCOEFF_NORMED, mask=mask)
+    # 掩码区域方差为 0 时结果可能为 NaN/Inf，统一视为最差匹配
+    np.nan_to_num(result, copy=False, nan=-1.0, posinf=-1.0, neginf=-1.0)
+    _, _, _, max_loc = cv2.minMaxLoc(result)
+    
+    return int(max_loc[0])
+
+
+def _decode_slider(content: bytes) -> np.ndarray:
     """
-    清理临时文件
+    解码滑块图片
+    
+    启用掩码匹配时保留透明通道（BGRA），否则与背景图一样解码为 BGR。
     
     Args:
-        file_paths: 要清理的文件路径列表
-    """
-    for path in file_paths:
-        if path and os.path.exists(path):
-            try:
-                os.unlink(path)
-                logger.debug(f"已删除临时文件: {path}")
-            except Exception as e:
-                logger.warning(f"删除临时文件失败: {path}, 错误: {e}")
+        content: 滑块图片字节内容
+    
+    Returns:
+        滑块图数组
+    """
+    if not settings.opencv.mask_match:
+        return _decode_image(content, "滑块图")
+    
+    slider = _decode_image(content, "滑块图", cv2.IMREAD_UNCHANGED)
+    if slider.dtype == np.uint16:
+        # 与 IMREAD_COLOR 一致，16 位图片只保留高 8 位
+        slider = (slider >> 8).astype(np.uint8)
+    elif slider.dtype != np.uint8:
+        # 其他位深（如浮点 TIFF）交由 IMREAD_COLOR 转换
+        return _decode_image(content, "滑块图")
+    
+    if slider.ndim == 3 and slider.shape[2] == 4:
+        return slider
+    
+    logger.debug("滑块图不带透明通道，回退到默认匹配算法")
+    # 复用已解码的数组转换为 BGR（与 IMREAD_COLOR 解码结果一致），无需重新解码
+    if slider.ndim == 2:
+        return cv2.cvtColor(slider, cv2.COLOR_GRAY2BGR)
+    return slider
+
+
+def _decode_image(
+    content: bytes,
+    name: str,
+    flags: int = cv2.IMREAD_COLOR,
+) -> np.ndarray:
+    """
+    从内存字节解码图片
+    
+    np.frombuffer 直接复用 bytes 对象的内存，不产生额外拷贝。
+    
+    Args:
+        content: 图片字节内容
+        name: 图片名称（用于错误信息）
+        flags: cv2.imdecode 读取模式，默认 BGR 三通道
+    
+    Returns:
+        解码后的图片数组
+    
+    Raises:
+        ValueError: 图片数据无法解码时
+    """
+    img = cv2.imdecode(np.frombuffer(content, dtype=np.uint8), flags)
+    if img is None:
+        raise ValueError(f"{name}解码失败: 不支持的图片格式或数据已损坏")
+    return img
@@ -6,7 +6,6 @@
 
 import sys
 import signal
-import traceback
 from typing import Callable, Optional
 
 from fastapi import FastAPI, Request
@@ -53,9 +52,10 @@ def register_exception_handlers(app: FastAPI) -> None:
             标准格式的 JSON 错误响应
         """
         logger.warning(
-            f"业务异常 | 路径: {request.url.path} | "
-            f"类型: {exc.__class__.__name__} | "
-            f"信息: {exc.message}"
+            "业务异常 | 路径: %s | 类型: %s | 信息: %s",
+            request.url.path,
+            exc.__class__.__name__,
+            exc.message,
         )
         
         return JSONResponse(
@@ -82,7 +82,9 @@ def register_exception_handlers(app: FastAPI) -> None:
             标准格式的 JSON 错误响应
         """
         logger.warning(
-            f"参数错误 | 路径: {request.url.path} | 信息: {str(exc)}"
+            "参数错误 | 路径: %s | 信息: %s",
+            request.url.path,
+            exc,
         )
         
         return JSONResponse(
@@ -108,12 +110,13 @@ def register_exception_handlers(app: FastAPI) -> None:
         Returns:
             标准格式的 JSON 错误响应
         """
-        # 记录完整的异常堆栈
+        # 记录完整的异常堆栈（由日志系统在实际输出时格式化）
         logger.error(
-            f"未处理异常 | 路径: {request.url.path} | "
-            f"类型: {exc.__class__.__name__} | "
-            f"信息: {str(exc)}\n"
-            f"堆栈追踪:\n{traceback.format_exc()}"
+            "未处理异常 | 路径: %s | 类型: %s | 信息: %s",
+            request.url.path,
+            exc.__class__.__name__,
+            exc,
+            exc_info=exc,
         )
         
         return JSONResponse(
@@ -145,9 +148,11 @@ def handle_exception(exc: Exception, context: Optional[str] = None) -> None:
     """
     context_msg = f" [{context}]" if context else ""
     logger.error(
-        f"异常{context_msg} | 类型: {exc.__class__.__name__} | "
-        f"信息: {str(exc)}\n"
-        f"堆栈追踪:\n{traceback.format_exc()}"
+        "异常%s | 类型: %s | 信息: %s",
+        context_msg,
+        exc.__class__.__name__,
+        exc,
+        exc_info=exc,
     )
 
 
@@ -175,7 +180,7 @@ def setup_signal_handlers(cleanup_callback: Optional[Callable] = None) -> None:
             frame: 当前栈帧
         """
         signal_name = signal.Signals(signum).name
-        logger.info(f"收到 {signal_name} 信号，正在优雅退出...")
+        logger.info("收到 %s 信号，正在优雅退出...", signal_name)
         
         # 执行清理回调
         if cleanup_callback:
@@ -183,7 +188,7 @@ def setup_signal_handlers(cleanup_callback: Optional[Callable] = None) -> None:
                 cleanup_callback()
                 logger.info("清理操作完成")
             except Exception as e:
-                logger.error(f"清理操作失败: {e}")
+                logger.error("清理操作失败: %s", e)
         
         logger.info("应用已退出")
         sys.exit(0)
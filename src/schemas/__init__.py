@@ -8,6 +8,8 @@ from src.schemas.request import SliderRequest, RecognitionMethod, ArithmeticRequ
 from src.schemas.response import (
     BaseResponse,
     SliderResponse,
+    RecommendedSizesResponse,
+    ArithmeticResponse,
     HealthResponse,
     ServiceInfoResponse,
     create_response,
@@ -24,6 +26,8 @@ __all__ = [
     # 响应模型
     "BaseResponse",
     "SliderResponse",
+    "RecommendedSizesResponse",
+    "ArithmeticResponse",
     "HealthResponse",
     "ServiceInfoResponse",
     # 响应工厂函数
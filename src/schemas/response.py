@@ -4,7 +4,7 @@
 定义 API 响应的数据结构和工厂函数。
 """
 
-from typing import Any, Optional, TypeVar, Generic
+from typing import Any, Optional, TypeVar, Generic, Union
 
 from pydantic import BaseModel, Field
 
@@ -61,11 +61,37 @@ class BaseResponse(BaseModel, Generic[T]):
     )
 
 
-class SliderResponse(BaseResponse[str]):
+class SliderResponse(BaseResponse[Union[int, str]]):
     """
     滑块识别响应模型
     
     滑块识别接口的响应数据结构。
+    data 为整数距离；兼容期内仍接受旧版的字符串格式。
+    """
+    pass
+
+
+class RecommendedSizes(BaseModel):
+    """推荐图片尺寸数据"""
+    
+    big_image_width: int = Field(description="背景图推荐缩放宽度")
+    small_image_width: int = Field(description="滑块图推荐缩放宽度")
+
+
+class RecommendedSizesResponse(BaseResponse[RecommendedSizes]):
+    """
+    推荐尺寸响应模型
+    
+    获取推荐尺寸接口的响应数据结构。
+    """
+    pass
+
+
+class ArithmeticResponse(BaseResponse[int]):
+    """
+    算术识别响应模型
+    
+    算术验证码识别接口的响应数据结构，data 为计算结果。
     """
     pass
 
@@ -177,7 +203,7 @@ def create_success_response(
     
     使用示例:
         >>> response = create_success_response(
-        ...     data="125",
+        ...     data=125,
         ...     description="计算成功"
         ... )
     """
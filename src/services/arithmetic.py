@@ -4,20 +4,57 @@
 提供算术验证码的 OCR 识别和计算功能。
 """
 
+import asyncio
+import io
+import operator
 import re
+import threading
+from concurrent.futures import Executor
 from typing import Optional
 
 import ddddocr
+from PIL import Image
 
+from src.config import settings
 from src.exceptions import OCRRecognitionError
 from src.logger import get_logger
-from src.utils import get_image_content
+from src.utils import LRUCache, aget_image_content, content_hash, get_image_content
 
 
 logger = get_logger(__name__)
 
+# 运算符标准化转换表（一次 str.translate 完成全部替换，并移除空格）
+_OPERATOR_TABLE = str.maketrans({
+    "×": "*",
+    "x": "*",
+    "X": "*",
+    "÷": "/",
+    "－": "-",
+    "—": "-",
+    "＋": "+",
+    "＝": "=",
+    " ": None,
+})
+
+# 算术表达式正则表达式（预编译以提高性能）
+# 匹配: 数字 运算符 数字
+_EXPRESSION_PATTERN = re.compile(r"^(\d+)\s*([+\-*/])\s*(\d+)$")
+
+# 计算结果缓存（键为图片内容哈希）
+_result_cache = LRUCache(max_size=settings.cache.max_size)
+
+# 运算符分派表（除法为整数除法）
+_OPERATORS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.floordiv,
+}
+
 # 全局 OCR 实例（延迟初始化）
 _arithmetic_ocr_instance: Optional[ddddocr.DdddOcr] = None
+# 保护 OCR 实例初始化的锁（避免并发首次请求重复加载模型）
+_arithmetic_ocr_lock = threading.Lock()
 
 
 def _get_arithmetic_ocr_instance() -> ddddocr.DdddOcr:
@@ -26,17 +63,33 @@ def _get_arithmetic_ocr_instance() -> ddddocr.DdddOcr:
     
     Returns:
         ddddocr.DdddOcr 实例（启用 OCR 功能）
+    
+    初始化过程使用双重检查锁，保证并发场景下模型只加载一次。
     """
     global _arithmetic_ocr_instance
     
     if _arithmetic_ocr_instance is None:
-        logger.info("初始化算术识别 OCR 引擎...")
-        _arithmetic_ocr_instance = ddddocr.DdddOcr(show_ad=False)
-        logger.info("算术识别 OCR 引擎初始化完成")
+        with _arithmetic_ocr_lock:
+            if _arithmetic_ocr_instance is None:
+                logger.info("初始化算术识别 OCR 引擎...")
+                _arithmetic_ocr_instance = ddddocr.DdddOcr(show_ad=False)
+                logger.info("算术识别 OCR 引擎初始化完成")
     
     return _arithmetic_ocr_instance
 
 
+def warmup() -> None:
+    """
+    预热算术识别 OCR 引擎
+    
+    加载模型并识别一张 1x1 像素的空白图片，
+    让推理会话完成首次运行的初始化，避免首个请求承担加载耗时。
+    """
+    output = io.BytesIO()
+    Image.new("L", (1, 1)).save(output, format="PNG")
+    _get_arithmetic_ocr_instance().classification(output.getvalue())
+
+
 class ArithmeticService:
     """
     算术验证码识别服务
@@ -47,10 +100,17 @@ class ArithmeticService:
         >>> service = ArithmeticService()
         >>> result = service.recognize_and_calculate("https://example.com/captcha.jpg")
         >>> print(result)  # 输出: 18
+        >>> result = await service.arecognize_and_calculate("https://example.com/captcha.jpg")
     """
     
-    def __init__(self) -> None:
-        """初始化服务"""
+    def __init__(self, executor: Optional[Executor] = None) -> None:
+        """
+        初始化服务
+        
+        Args:
+            executor: 执行识别计算的线程池，None 表示使用事件循环默认线程池
+        """
+        self._executor = executor
         self._ocr = _get_arithmetic_ocr_instance()
     
     def recognize_and_calculate(self, image_input: str) -> int:
@@ -64,32 +124,83 @@ class ArithmeticService:
             计算结果（整数）
         
         Raises:
+            ImageError: 图片获取失败时
             OCRRecognitionError: 识别或计算失败时
         """
         logger.info("开始算术验证码识别...")
         
+        # 获取图片内容（失败时抛出图片相关异常，由全局异常处理器处理）
+        image_bytes = get_image_content(image_input)
+        
+        return self._recognize_image(image_bytes)
+    
+    async def arecognize_and_calculate(self, image_input: str) -> int:
+        """
+        异步识别算术验证码并计算结果
+        
+        使用全局异步 HTTP 客户端获取图片（不占用线程池线程等待网络），
+        再在线程池中执行 OCR 识别和计算。
+        
+        Args:
+            image_input: 图片输入（URL 或 Base64）
+        
+        Returns:
+            计算结果（整数）
+        
+        Raises:
+            ImageError: 图片获取失败时
+            OCRRecognitionError: 识别或计算失败时
+        """
+        logger.info("开始算术验证码识别...")
+        
+        # 获取图片内容（失败时抛出图片相关异常，由全局异常处理器处理）
+        image_bytes = await aget_image_content(image_input)
+        
+        # 在线程池中执行识别计算，避免阻塞事件循环
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._recognize_image, image_bytes)
+    
+    def _recognize_image(self, image_bytes: bytes) -> int:
+        """
+        识别图片中的算术表达式并计算结果
+        
+        Args:
+            image_bytes: 验证码图片字节内容
+        
+        Returns:
+            计算结果（整数）
+        
+        Raises:
+            OCRRecognitionError: 识别或计算失败时
+        """
+        # 查询结果缓存（相同图片直接返回，跳过 OCR 推理）
+        cache_key = None
+        if settings.cache.enabled:
+            cache_key = content_hash(image_bytes)
+            cached = _result_cache.get(cache_key)
+            if cached is not None:
+                logger.info("算术验证码识别命中缓存: 结果=%s", cached)
+                return cached
+        
+        # OCR 识别（仅将第三方库异常转换为业务异常）
         try:
-            # 获取图片内容
-            image_bytes = get_image_content(image_input)
-            
-            # OCR 识别
             ocr_result = self._ocr.classification(image_bytes)
-            logger.info(f"OCR 识别结果: {ocr_result}")
-            
-            # 解析并计算
-            result = self._parse_and_calculate(ocr_result)
-            logger.info(f"计算结果: {result}")
-            
-            return result
-            
-        except OCRRecognitionError:
-            raise
         except Exception as e:
             logger.error(f"算术验证码识别失败: {e}")
             raise OCRRecognitionError(
                 message="算术验证码识别失败",
                 details=str(e),
             )
+        logger.info(f"OCR 识别结果: {ocr_result}")
+        
+        # 解析并计算
+        result = self._parse_and_calculate(ocr_result)
+        logger.info(f"计算结果: {result}")
+        
+        if cache_key is not None:
+            _result_cache.set(cache_key, result)
+        
+        return result
     
     def _parse_and_calculate(self, expression: str) -> int:
         """
@@ -108,24 +219,11 @@ class ArithmeticService:
         """
         logger.debug(f"解析表达式: {expression}")
         
-        # 清理表达式
-        expr = expression.strip()
-        
-        # 移除等号及其后面的内容
-        expr = re.split(r'[=＝]', expr)[0].strip()
-        
-        # 标准化运算符
-        expr = expr.replace('×', '*').replace('x', '*').replace('X', '*')
-        expr = expr.replace('÷', '/').replace('/', '/')
-        expr = expr.replace('－', '-').replace('—', '-')
-        expr = expr.replace('＋', '+')
-        
-        # 移除空格
-        expr = expr.replace(' ', '')
+        # 标准化运算符并移除空格，再移除等号及其后面的内容
+        expr = expression.translate(_OPERATOR_TABLE).partition("=")[0].strip()
         
         # 提取数字和运算符
-        # 匹配: 数字 运算符 数字
-        match = re.match(r'^(\d+)\s*([+\-*/])\s*(\d+)$', expr)
+        match = _EXPRESSION_PATTERN.match(expr)
         
         if not match:
             logger.error(f"无法解析表达式: {expression} -> {expr}")
@@ -134,31 +232,23 @@ class ArithmeticService:
                 details=f"原始: {expression}, 处理后: {expr}",
             )
         
-        num1 = int(match.group(1))
-        operator = match.group(2)
-        num2 = int(match.group(3))
+        num1 = int(match[1])
+        op = match[2]
+        num2 = int(match[3])
         
-        logger.debug(f"解析结果: {num1} {operator} {num2}")
+        logger.debug(f"解析结果: {num1} {op} {num2}")
         
         # 计算
-        if operator == '+':
-            result = num1 + num2
-        elif operator == '-':
-            result = num1 - num2
-        elif operator == '*':
-            result = num1 * num2
-        elif operator == '/':
-            if num2 == 0:
-                raise OCRRecognitionError(
-                    message="除数不能为零",
-                    details=f"{num1} / {num2}",
-                )
-            result = num1 // num2  # 整数除法
-        else:
+        func = _OPERATORS.get(op)
+        if func is None:
             raise OCRRecognitionError(
                 message="不支持的运算符",
-                details=f"运算符: {operator}",
+                details=f"运算符: {op}",
+            )
+        if op == "/" and num2 == 0:
+            raise OCRRecognitionError(
+                message="除数不能为零",
+                details=f"{num1} / {num2}",
             )
         
-        return result
-
+        return func(num1, num2)
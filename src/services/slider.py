@@ -4,12 +4,15 @@
 提供滑块验证码识别的业务逻辑封装。
 """
 
-from typing import Optional
+import asyncio
+from concurrent.futures import Executor
+from typing import Callable, ClassVar, Dict, Optional, Tuple
 
+from src.config import settings
 from src.core import recognize_by_ocr, recognize_by_opencv
-from src.exceptions import RecognitionError
 from src.logger import get_logger
 from src.schemas import SliderRequest, RecognitionMethod
+from src.utils import aget_image_content
 
 
 logger = get_logger(__name__)
@@ -27,15 +30,21 @@ class SliderService:
         ...     background_url="https://example.com/bg.jpg",
         ...     slider_url="https://example.com/slider.png"
         ... )
-        >>> distance = service.calculate_distance(request)
+        >>> distance = await service.calculate_distance(request)
         >>> print(f"滑块距离: {distance}")
     """
     
-    def __init__(self) -> None:
-        """初始化滑块识别服务"""
+    def __init__(self, executor: Optional[Executor] = None) -> None:
+        """
+        初始化滑块识别服务
+        
+        Args:
+            executor: 执行识别计算的线程池，None 表示使用事件循环默认线程池
+        """
+        self._executor = executor
         logger.debug("SliderService 初始化")
     
-    def calculate_distance(self, request: SliderRequest) -> int:
+    async def calculate_distance(self, request: SliderRequest) -> int:
         """
         计算滑块距离
         
@@ -48,94 +57,151 @@ class SliderService:
             滑块需要移动的像素距离（已应用偏移量校正）
         
         Raises:
+            ImageError: 图片获取失败时
             RecognitionError: 识别失败时
         
         处理流程:
             1. 记录请求参数
-            2. 根据 method 选择识别算法
-            3. 执行识别并获取原始距离
-            4. 应用偏移量校正
-            5. 返回最终距离
+            2. 并发获取背景图和滑块图内容
+            3. 根据 method 选择识别算法
+            4. 在线程池中执行识别并获取原始距离
+            5. 应用偏移量校正
+            6. 返回最终距离
         """
         logger.info(
-            f"开始计算滑块距离 | 方法: {request.method.value} | "
-            f"偏移量: {request.offset}"
+            "开始计算滑块距离 | 方法: %s | 偏移量: %s",
+            request.method.value,
+            request.offset,
         )
         
-        try:
-            # 根据方法选择识别算法
-            if request.method == RecognitionMethod.OPENCV:
-                raw_distance = self._recognize_opencv(request)
-            else:
-                raw_distance = self._recognize_ocr(request)
-            
-            # 应用偏移量校正
-            final_distance = raw_distance - request.offset
-            
-            # 确保距离不为负数
-            if final_distance < 0:
-                logger.warning(
-                    f"计算结果为负数，已调整为 0 | "
-                    f"原始: {raw_distance}, 偏移: {request.offset}"
-                )
-                final_distance = 0
-            
-            logger.info(
-                f"滑块距离计算完成 | 原始: {raw_distance} | "
-                f"偏移: {request.offset} | 最终: {final_distance}"
-            )
-            
-            return final_distance
-            
-        except RecognitionError:
-            # 重新抛出已知的识别异常
-            raise
-        except Exception as e:
-            logger.error(f"计算滑块距离时发生未知错误: {e}")
-            raise RecognitionError(
-                message="计算滑块距离失败",
-                details=str(e),
+        # 并发获取图片内容（URL 下载复用全局连接池）
+        background_image, slider_image = await asyncio.gather(
+            aget_image_content(request.background_url),
+            aget_image_content(request.slider_url),
+        )
+        
+        # 根据方法查表选择识别算法
+        recognize = self._RECOGNIZERS[request.method]
+        
+        # 在线程池中执行识别计算，避免阻塞事件循环
+        loop = asyncio.get_running_loop()
+        raw_distance = await loop.run_in_executor(
+            self._executor,
+            recognize,
+            self,
+            request,
+            background_image,
+            slider_image,
+        )
+        
+        # 应用偏移量校正
+        final_distance = raw_distance - request.offset
+        
+        # 确保距离不为负数
+        if final_distance < 0:
+            logger.warning(
+                "计算结果为负数，已调整为 0 | 原始: %s, 偏移: %s",
+                raw_distance,
+                request.offset,
             )
+            final_distance = 0
+        
+        logger.info(
+            "滑块距离计算完成 | 原始: %s | 偏移: %s | 最终: %s",
+            raw_distance,
+            request.offset,
+            final_distance,
+        )
+        
+        return final_distance
     
-    def _recognize_ocr(self, request: SliderRequest) -> int:
+    def _recognize_ocr(
+        self,
+        request: SliderRequest,
+        background_image: bytes,
+        slider_image: bytes,
+    ) -> int:
         """
         使用 OCR 方法识别
         
         Args:
             request: 滑块识别请求
+            background_image: 背景图片字节内容
+            slider_image: 滑块图片字节内容
         
         Returns:
             原始识别距离
         """
         logger.debug("使用 OCR 方法进行识别")
         
+        big_width, small_width = self._resolve_widths(request)
+        
         return recognize_by_ocr(
-            background_input=request.background_url,
-            slider_input=request.slider_url,
-            big_width=request.big_image_width,
-            small_width=request.small_image_width,
+            background_image=background_image,
+            slider_image=slider_image,
+            big_width=big_width,
+            small_width=small_width,
             simple_target=True,
         )
     
-    def _recognize_opencv(self, request: SliderRequest) -> int:
+    def _recognize_opencv(
+        self,
+        request: SliderRequest,
+        background_image: bytes,
+        slider_image: bytes,
+    ) -> int:
         """
         使用 OpenCV 方法识别
         
         Args:
             request: 滑块识别请求
+            background_image: 背景图片字节内容
+            slider_image: 滑块图片字节内容
         
         Returns:
             原始识别距离
         """
         logger.debug("使用 OpenCV 方法进行识别")
         
+        big_width, small_width = self._resolve_widths(request)
+        
         return recognize_by_opencv(
-            background_input=request.background_url,
-            slider_input=request.slider_url,
-            big_width=request.big_image_width,
-            small_width=request.small_image_width,
+            background_content=background_image,
+            slider_content=slider_image,
+            big_width=big_width,
+            small_width=small_width,
         )
     
+    # 识别方法分派表（识别方法 -> 识别函数）
+    _RECOGNIZERS: ClassVar[Dict[RecognitionMethod, Callable[..., int]]] = {
+        RecognitionMethod.OCR: _recognize_ocr,
+        RecognitionMethod.OPENCV: _recognize_opencv,
+    }
+    
+    @staticmethod
+    def _resolve_widths(request: SliderRequest) -> Tuple[Optional[int], Optional[int]]:
+        """
+        确定图片缩放宽度
+        
+        优先级: 请求参数 > 默认宽度配置 > 推荐宽度（仅在启用 force_resize 时）。
+        
+        Args:
+            request: 滑块识别请求
+        
+        Returns:
+            (背景图宽度, 滑块图宽度)，None 表示不缩放
+        """
+        config = settings.image
+        
+        big_width = request.big_image_width or config.default_big_width
+        small_width = request.small_image_width or config.default_small_width
+        
+        if config.force_resize:
+            big_width = big_width or config.recommended_big_width
+            small_width = small_width or config.recommended_small_width
+        
+        return big_width, small_width
+    
     @staticmethod
     def get_recommended_sizes() -> dict:
         """
@@ -144,8 +210,6 @@ class SliderService:
         Returns:
             包含推荐尺寸的字典
         """
-        from src.config import settings
-        
         return {
             "big_image_width": settings.image.recommended_big_width,
             "small_image_width": settings.image.recommended_small_width,
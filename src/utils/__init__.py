@@ -5,7 +5,16 @@
 """
 
 from src.utils.validators import is_url, is_base64
-from src.utils.image import get_image_content, resize_image
+from src.utils.image import (
+    get_image_content,
+    aget_image_content,
+    resize_image,
+    resize_image_array,
+    clear_image_cache,
+    init_http_client,
+    close_http_client,
+)
+from src.utils.cache import LRUCache, content_hash
 
 __all__ = [
     # 验证器
@@ -13,6 +22,15 @@ __all__ = [
     "is_base64",
     # 图片处理
     "get_image_content",
+    "aget_image_content",
     "resize_image",
+    "resize_image_array",
+    "clear_image_cache",
+    # HTTP 客户端
+    "init_http_client",
+    "close_http_client",
+    # 缓存
+    "LRUCache",
+    "content_hash",
 ]
 
@@ -0,0 +1,121 @@
+"""
+缓存工具
+
+提供线程安全的 LRU 缓存和图片内容哈希功能。
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+def content_hash(content: bytes) -> bytes:
+    """
+    计算图片内容哈希
+    
+    使用 blake2b（16 字节摘要）计算内容哈希，速度快于 SHA 系列算法，
+    适合作为缓存键。
+    
+    Args:
+        content: 图片字节内容
+    
+    Returns:
+        16 字节的哈希摘要
+    
+    使用示例:
+        >>> key = content_hash(b"image bytes")
+        >>> len(key)
+        16
+    """
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+
+class LRUCache:
+    """
+    线程安全的 LRU 缓存
+    
+    基于 OrderedDict 实现，超出容量时淘汰最久未使用的条目。
+    指定 max_bytes 时按值的 len() 累计占用字节数，超出字节预算同样淘汰。
+    
+    Attributes:
+        max_size: 最大缓存条目数
+        max_bytes: 最大缓存字节数，None 表示不限制
+    
+    使用示例:
+        >>> cache = LRUCache(max_size=2)
+        >>> cache.set("a", 1)
+        >>> cache.get("a")
+        1
+    """
+    
+    def __init__(self, max_size: int, max_bytes: Optional[int] = None) -> None:
+        """
+        初始化缓存
+        
+        Args:
+            max_size: 最大缓存条目数
+            max_bytes: 最大缓存字节数（值需支持 len()），None 表示不限制
+        """
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        获取缓存值
+        
+        Args:
+            key: 缓存键
+        
+        Returns:
+            缓存值，未命中时返回 None
+        """
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        写入缓存值
+        
+        Args:
+            key: 缓存键
+            value: 缓存值
+        """
+        if self.max_size <= 0:
+            return
+        
+        size = 0
+        if self.max_bytes is not None:
+            size = len(value)
+            # 单个值超出字节预算时不缓存
+            if size > self.max_bytes:
+                return
+        
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None and self.max_bytes is not None:
+                self._bytes -= len(old)
+            self._data[key] = value
+            self._bytes += size
+            while len(self._data) > self.max_size or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                _, evicted = self._data.popitem(last=False)
+                if self.max_bytes is not None:
+                    self._bytes -= len(evicted)
+    
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+    
+    def __len__(self) -> int:
+        """返回当前缓存条目数"""
+        return len(self._data)
@@ -4,27 +4,173 @@
 提供图片下载、解码和处理功能。
 """
 
-import base64
-import io
+import asyncio
+import re
+import struct
 from typing import Optional
 
+import cv2
+import httpx
+import numpy as np
 import requests
-from PIL import Image
+from requests.adapters import HTTPAdapter
 
 from src.config import settings
 from src.exceptions import ImageDownloadError, ImageDecodeError, ImageProcessError
 from src.logger import get_logger
-from src.utils.validators import is_url
+from src.utils.cache import LRUCache, content_hash
+
+try:
+    from pybase64 import b64decode as _b64decode
+except ImportError:  # pybase64 为可选依赖，未安装时直接使用 binascii（跳过 base64 模块的包装层）
+    from binascii import a2b_base64 as _b64decode
 
 
 logger = get_logger(__name__)
 
+# 默认请求头
+_DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+
+# 输入类型分派表（按前 5 个字符查表，替代逐个前缀匹配）
+_INPUT_KINDS = {
+    "http:": "url",
+    "https": "url",
+    "data:": "data_uri",
+}
+
+# Data URI 头部正则表达式（预编译以提高性能）
+_DATA_URI_PATTERN = re.compile(r"^data:[^,]*,")
+
+# 流式下载的分块大小（字节）
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# 异步下载最多跟随的重定向次数（与 requests 默认值一致）
+_MAX_REDIRECTS = 30
+
+# 缩放后图片的编码参数
+_JPEG_ENCODE_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, 92]
+_PNG_ENCODE_PARAMS = [cv2.IMWRITE_PNG_COMPRESSION, 1]
+
+# URL 图片内容缓存（键为 URL 哈希，按字节预算淘汰；Base64 解码开销与计算哈希相当，不缓存）
+_content_cache = LRUCache(
+    max_size=settings.cache.max_size,
+    max_bytes=settings.cache.content_max_bytes,
+)
+
+# 全局异步 HTTP 客户端（在应用生命周期中创建，复用连接池）
+_async_client: Optional[httpx.AsyncClient] = None
+
+
+def _create_session() -> requests.Session:
+    """
+    创建同步 HTTP 会话
+    
+    挂载带连接池的 HTTPAdapter，在多次同步下载之间复用 TCP/TLS 连接。
+    
+    Returns:
+        配置好默认请求头和连接池的 requests.Session
+    """
+    session = requests.Session()
+    session.headers.update(_DEFAULT_HEADERS)
+    adapter = HTTPAdapter(
+        pool_connections=settings.image.http_pool_size,
+        pool_maxsize=settings.image.http_pool_size,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# 全局同步 HTTP 会话（供同步下载路径复用连接池）
+_session = _create_session()
+
+
+async def init_http_client() -> None:
+    """
+    初始化全局异步 HTTP 客户端
+    
+    创建启用 HTTP/2 和连接池的 httpx.AsyncClient，
+    在多个请求之间复用 TCP/TLS 连接，并与同步下载一样跟随重定向。应在应用启动时调用。
+    """
+    global _async_client
+    
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(
+            http2=True,
+            headers=_DEFAULT_HEADERS,
+            # httpx 默认不跟随重定向（requests 默认跟随），图片常经 http→https 或 CDN 跳转
+            follow_redirects=True,
+            max_redirects=_MAX_REDIRECTS,
+            timeout=settings.image.download_timeout,
+            limits=httpx.Limits(
+                max_keepalive_connections=settings.image.http_pool_size,
+            ),
+        )
+        logger.info("异步 HTTP 客户端初始化完成")
+
+
+async def close_http_client() -> None:
+    """
+    关闭全局异步 HTTP 客户端
+    
+    释放连接池中的所有连接。应在应用关闭时调用。
+    """
+    global _async_client
+    
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+        logger.info("异步 HTTP 客户端已关闭")
+
+
+async def aget_image_content(image_input: str) -> bytes:
+    """
+    异步获取图片内容
+    
+    与 get_image_content 功能相同，但 URL 下载使用全局异步 HTTP 客户端，
+    Base64 在线程中解码，不会阻塞事件循环，可配合 asyncio.gather 并发获取多张图片。
+    
+    Args:
+        image_input: 图片输入（URL、Data URI 或纯 Base64）
+    
+    Returns:
+        图片的字节内容
+    
+    Raises:
+        ImageDownloadError: URL 下载失败时
+        ImageDecodeError: Base64 解码失败时
+    
+    使用示例:
+        >>> background, slider = await asyncio.gather(
+        ...     aget_image_content("https://example.com/bg.jpg"),
+        ...     aget_image_content("https://example.com/slider.png"),
+        ... )
+    """
+    if _input_kind(image_input) != "url":
+        # 在线程中解码 Base64，避免大体积 Data URI 阻塞事件循环
+        return await asyncio.to_thread(_decode_base64_image, image_input)
+    
+    cache_key = _content_cache_key(image_input)
+    if cache_key is not None:
+        cached = _content_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("图片内容命中缓存: %s", image_input[:100])
+            return cached
+    
+    content = await _adownload_image(image_input)
+    if cache_key is not None:
+        _content_cache.set(cache_key, content)
+    return content
+
 
 def get_image_content(image_input: str) -> bytes:
     """
     获取图片内容
     
     支持从 URL 下载或从 Base64 解码获取图片字节内容。
+    设置 CACHE_CONTENT_MAX_BYTES 后，URL 下载结果按字节预算缓存。
     
     Args:
         image_input: 图片输入，支持以下格式：
@@ -44,10 +190,58 @@ def get_image_content(image_input: str) -> bytes:
         >>> print(len(content))
         12345
     """
-    if is_url(image_input):
-        return _download_image(image_input)
-    else:
+    if _input_kind(image_input) != "url":
         return _decode_base64_image(image_input)
+    
+    cache_key = _content_cache_key(image_input)
+    if cache_key is not None:
+        cached = _content_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("图片内容命中缓存: %s", image_input[:100])
+            return cached
+    
+    content = _download_image(image_input)
+    if cache_key is not None:
+        _content_cache.set(cache_key, content)
+    return content
+
+
+def clear_image_cache() -> None:
+    """
+    清空 URL 图片内容缓存
+    
+    使用示例:
+        >>> clear_image_cache()
+    """
+    _content_cache.clear()
+
+
+def _content_cache_key(url: str) -> Optional[bytes]:
+    """
+    计算 URL 图片内容缓存键
+    
+    Args:
+        url: 图片 URL
+    
+    Returns:
+        URL 哈希；未启用内容缓存时返回 None
+    """
+    if not settings.cache.enabled or settings.cache.content_max_bytes <= 0:
+        return None
+    return content_hash(url.encode())
+
+
+def _input_kind(image_input: str) -> str:
+    """
+    根据输入前缀判断图片输入类型
+    
+    Args:
+        image_input: 图片输入
+    
+    Returns:
+        输入类型: "url", "data_uri" 或 "base64"
+    """
+    return _INPUT_KINDS.get(image_input[:5], "base64")
 
 
 def _download_image(url: str) -> bytes:
@@ -63,31 +257,90 @@ def _download_image(url: str) -> bytes:
     Raises:
         ImageDownloadError: 下载失败时
     """
-    logger.info(f"开始下载图片: {url[:100]}...")
+    logger.info("开始下载图片: %s...", url[:100])
     
     try:
-        response = requests.get(
+        # 流式读取响应体，超出大小上限时立即中止
+        with _session.get(
             url,
             timeout=settings.image.download_timeout,
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            },
-        )
-        response.raise_for_status()
+            stream=True,
+        ) as response:
+            response.raise_for_status()
+            _check_content_length(url, response.headers.get("Content-Length"))
+            
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(_DOWNLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                _check_download_size(url, size)
+                chunks.append(chunk)
         
-        content = response.content
-        logger.info(f"图片下载成功: 大小={len(content)} 字节")
+        content = b"".join(chunks)
+        logger.info("图片下载成功: 大小=%s 字节", len(content))
         return content
         
     except requests.Timeout as e:
-        logger.error(f"图片下载超时: {url}")
+        logger.error("图片下载超时: %s", url)
         raise ImageDownloadError(
             message="图片下载超时",
             url=url,
             details=str(e),
         )
     except requests.RequestException as e:
-        logger.error(f"图片下载失败: {url}, 错误: {e}")
+        logger.error("图片下载失败: %s, 错误: %s", url, e)
+        raise ImageDownloadError(
+            message="图片下载失败",
+            url=url,
+            details=str(e),
+        )
+
+
+async def _adownload_image(url: str) -> bytes:
+    """
+    从 URL 异步下载图片
+    
+    Args:
+        url: 图片 URL
+    
+    Returns:
+        图片字节内容
+    
+    Raises:
+        ImageDownloadError: 下载失败时
+    """
+    logger.info("开始下载图片: %s...", url[:100])
+    
+    if _async_client is None:
+        await init_http_client()
+    
+    try:
+        # 流式读取响应体，超出大小上限时立即中止
+        async with _async_client.stream("GET", url) as response:
+            response.raise_for_status()
+            _check_content_length(url, response.headers.get("Content-Length"))
+            
+            chunks = []
+            size = 0
+            async for chunk in response.aiter_bytes(_DOWNLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                _check_download_size(url, size)
+                chunks.append(chunk)
+        
+        content = b"".join(chunks)
+        logger.info("图片下载成功: 大小=%s 字节", len(content))
+        return content
+        
+    except httpx.TimeoutException as e:
+        logger.error("图片下载超时: %s", url)
+        raise ImageDownloadError(
+            message="图片下载超时",
+            url=url,
+            details=str(e),
+        )
+    # InvalidURL 在发送请求前抛出，不属于 HTTPError
+    except (httpx.HTTPError, httpx.InvalidURL) as e:
+        logger.error("图片下载失败: %s, 错误: %s", url, e)
         raise ImageDownloadError(
             message="图片下载失败",
             url=url,
@@ -95,6 +348,42 @@ def _download_image(url: str) -> bytes:
         )
 
 
+def _check_content_length(url: str, content_length: Optional[str]) -> None:
+    """
+    根据 Content-Length 响应头提前检查图片大小
+    
+    Args:
+        url: 图片 URL
+        content_length: Content-Length 响应头，缺失时为 None
+    
+    Raises:
+        ImageDownloadError: 声明的大小超出上限时
+    """
+    if content_length is not None and content_length.isdigit():
+        _check_download_size(url, int(content_length))
+
+
+def _check_download_size(url: str, size: int) -> None:
+    """
+    检查已下载的图片大小
+    
+    Args:
+        url: 图片 URL
+        size: 已下载（或声明）的字节数
+    
+    Raises:
+        ImageDownloadError: 超出 IMAGE_MAX_DOWNLOAD_BYTES 上限时
+    """
+    max_bytes = settings.image.max_download_bytes
+    if size > max_bytes:
+        logger.error("图片过大: %s, 大小超过 %s 字节", url, max_bytes)
+        raise ImageDownloadError(
+            message="图片过大",
+            url=url,
+            details=f"图片大小超过上限 {max_bytes} 字节",
+        )
+
+
 def _decode_base64_image(image_input: str) -> bytes:
     """
     解码 Base64 图片
@@ -112,23 +401,21 @@ def _decode_base64_image(image_input: str) -> bytes:
     
     try:
         # 处理 Data URI 格式 (data:image/png;base64,xxxxx)
-        if image_input.startswith("data:"):
+        match = _DATA_URI_PATTERN.match(image_input)
+        if match:
             # 提取 Base64 部分
-            if "," in image_input:
-                base64_data = image_input.split(",", 1)[1]
-            else:
-                base64_data = image_input
+            base64_data = image_input[match.end():]
             logger.debug("已提取 Data URI 中的 Base64 数据")
         else:
             base64_data = image_input
         
-        # 解码 Base64
-        content = base64.b64decode(base64_data)
-        logger.info(f"Base64 解码成功: 大小={len(content)} 字节")
+        # 解码 Base64（安装 pybase64 时使用其 SIMD 加速实现）
+        content = _b64decode(base64_data)
+        logger.info("Base64 解码成功: 大小=%s 字节", len(content))
         return content
         
     except Exception as e:
-        logger.error(f"Base64 解码失败: {e}")
+        logger.error("Base64 解码失败: %s", e)
         raise ImageDecodeError(
             message="无效的 Base64 格式",
             details=str(e),
@@ -139,7 +426,8 @@ def resize_image(image_bytes: bytes, target_width: Optional[int]) -> bytes:
     """
     调整图片宽度
     
-    保持宽高比调整图片到指定宽度。
+    保持宽高比调整图片到指定宽度。使用 OpenCV 解码和缩放（与 resize_image_array 一致），
+    带透明通道的图片重新编码为 PNG，其余图片编码为 JPEG（质量 92）。
     
     Args:
         image_bytes: 原始图片字节内容
@@ -157,42 +445,160 @@ def resize_image(image_bytes: bytes, target_width: Optional[int]) -> bytes:
     if target_width is None:
         return image_bytes
     
-    logger.debug(f"开始调整图片尺寸: 目标宽度={target_width}px")
+    # 从文件头读取宽度，已匹配时无需解码
+    if _peek_width(image_bytes) == target_width:
+        logger.debug("图片宽度已匹配，无需调整")
+        return image_bytes
+    
+    logger.debug("开始调整图片尺寸: 目标宽度=%spx", target_width)
     
     try:
-        # 打开图片
-        img = Image.open(io.BytesIO(image_bytes))
-        original_width, original_height = img.size
+        # 解码图片（保留透明通道）
+        img = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+        if img is None:
+            raise ValueError("图片解码失败: 不支持的图片格式或数据已损坏")
         
         # 如果宽度已经匹配，直接返回
-        if original_width == target_width:
-            logger.debug(f"图片宽度已匹配，无需调整")
+        if img.shape[1] == target_width:
+            logger.debug("图片宽度已匹配，无需调整")
             return image_bytes
         
-        # 计算新的高度，保持宽高比
-        aspect_ratio = original_height / original_width
-        new_height = int(target_width * aspect_ratio)
-        
-        # 调整大小
-        img_resized = img.resize((target_width, new_height), Image.LANCZOS)
+        resized = resize_image_array(img, target_width)
         
-        # 转换回字节
-        output = io.BytesIO()
-        img_format = img.format if img.format else "PNG"
-        img_resized.save(output, format=img_format)
-        result = output.getvalue()
+        # 透明通道和非 8 位图片只能无损保存为 PNG（使用低压缩级别加快编码），其余编码为 JPEG
+        if resized.dtype != np.uint8 or (resized.ndim == 3 and resized.shape[2] == 4):
+            ok, encoded = cv2.imencode(".png", resized, _PNG_ENCODE_PARAMS)
+        else:
+            ok, encoded = cv2.imencode(".jpg", resized, _JPEG_ENCODE_PARAMS)
+        if not ok:
+            raise ValueError("图片编码失败")
+        result = encoded.tobytes()
         
         logger.info(
-            f"图片尺寸调整完成: {original_width}x{original_height} -> "
-            f"{target_width}x{new_height}, 大小: {len(result)} 字节"
+            "图片尺寸调整完成: %sx%s -> %sx%s, 大小: %s 字节",
+            img.shape[1],
+            img.shape[0],
+            resized.shape[1],
+            resized.shape[0],
+            len(result),
         )
         return result
         
+    except ImageProcessError:
+        raise
     except Exception as e:
-        logger.error(f"图片尺寸调整失败: {e}")
+        logger.error("图片尺寸调整失败: %s", e)
         raise ImageProcessError(
             message="图片尺寸调整失败",
             operation="resize",
             details=str(e),
         )
 
+
+# PNG 文件签名
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# 携带图片尺寸的 JPEG SOF 标记（排除 DHT/JPG/DAC 等非 SOF 标记）
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _peek_width(image_bytes: bytes) -> Optional[int]:
+    """
+    从文件头读取图片宽度
+    
+    仅解析 PNG 的 IHDR 块和 JPEG 的 SOF 段，不解码像素数据。
+    
+    Args:
+        image_bytes: 图片字节内容
+    
+    Returns:
+        图片宽度（像素）；格式不支持或文件头不完整时返回 None
+    """
+    # PNG: 签名(8) + 块长度(4) + "IHDR"(4) + 宽度(4，大端)
+    if image_bytes.startswith(_PNG_SIGNATURE):
+        if len(image_bytes) >= 24 and image_bytes[12:16] == b"IHDR":
+            return struct.unpack(">I", image_bytes[16:20])[0]
+        return None
+    
+    # JPEG: 逐段扫描直到 SOF 段，段内依次为 长度(2) + 精度(1) + 高度(2) + 宽度(2)
+    if image_bytes.startswith(b"\xff\xd8"):
+        offset = 2
+        size = len(image_bytes)
+        while offset + 4 <= size:
+            if image_bytes[offset] != 0xFF:
+                return None
+            marker = image_bytes[offset + 1]
+            # 填充字节
+            if marker == 0xFF:
+                offset += 1
+                continue
+            # 无长度字段的独立标记
+            if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+                offset += 2
+                continue
+            (length,) = struct.unpack(">H", image_bytes[offset + 2:offset + 4])
+            if marker in _JPEG_SOF_MARKERS:
+                if offset + 9 > size:
+                    return None
+                return struct.unpack(">H", image_bytes[offset + 7:offset + 9])[0]
+            offset += 2 + length
+    
+    return None
+
+
+def resize_image_array(img: np.ndarray, target_width: Optional[int]) -> np.ndarray:
+    """
+    调整已解码图片数组的宽度
+    
+    保持宽高比调整图片到指定宽度，与 resize_image 计算尺寸的方式一致，
+    但直接在 ndarray 上使用 cv2.resize，无需重新编解码。
+    缩小使用 INTER_AREA，放大使用 INTER_LANCZOS4。
+    
+    Args:
+        img: 解码后的图片数组
+        target_width: 目标宽度（像素），None 表示不调整
+    
+    Returns:
+        调整后的图片数组
+    
+    Raises:
+        ImageProcessError: 处理失败时
+    
+    使用示例:
+        >>> resized = resize_image_array(img, target_width=340)
+    """
+    if target_width is None:
+        return img
+    
+    original_height, original_width = img.shape[:2]
+    
+    # 如果宽度已经匹配，直接返回
+    if original_width == target_width:
+        return img
+    
+    try:
+        # 计算新的高度，保持宽高比
+        aspect_ratio = original_height / original_width
+        new_height = int(target_width * aspect_ratio)
+        
+        interpolation = (
+            cv2.INTER_AREA if target_width < original_width else cv2.INTER_LANCZOS4
+        )
+        resized = cv2.resize(img, (target_width, new_height), interpolation=interpolation)
+        
+        logger.debug(
+            "图片尺寸调整完成: %sx%s -> %sx%s",
+            original_width,
+            original_height,
+            target_width,
+            new_height,
+        )
+        return resized
+        
+    except Exception as e:
+        logger.error("图片尺寸调整失败: %s", e)
+        raise ImageProcessError(
+            message="图片尺寸调整失败",
+            operation="resize",
+            details=str(e),
+        )
@@ -0,0 +1,3 @@
+"""
+测试用例
+"""
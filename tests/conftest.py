@@ -0,0 +1,48 @@
+"""
+测试公共夹具
+"""
+
+import http.server
+import threading
+from typing import Iterator
+
+import pytest
+
+
+# 测试服务器返回的图片内容
+IMAGE_BYTES = b"\x89PNG\r\n\x1a\n" + b"\x00" * 32
+
+
+class _RedirectHandler(http.server.BaseHTTPRequestHandler):
+    """/redirect 返回 302 跳转到 /img.png，/img.png 返回图片内容"""
+    
+    def do_GET(self) -> None:
+        if self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/img.png")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif self.path == "/img.png":
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(IMAGE_BYTES)))
+            self.end_headers()
+            self.wfile.write(IMAGE_BYTES)
+        else:
+            self.send_error(404)
+    
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def image_server() -> Iterator[str]:
+    """启动本地图片服务器，返回其基础 URL"""
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _RedirectHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,46 @@
+"""
+算术验证码识别服务测试
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.services import ArithmeticService
+from src.utils import close_http_client
+from tests.conftest import IMAGE_BYTES
+
+
+class _StubOCR:
+    """固定返回算术表达式的 OCR 替身，并记录收到的图片内容和执行线程"""
+    
+    def __init__(self) -> None:
+        self.images = []
+        self.threads = []
+    
+    def classification(self, image_bytes: bytes) -> str:
+        self.images.append(image_bytes)
+        self.threads.append(threading.current_thread().name)
+        return "3+5=?"
+
+
+async def _arecognize_and_close(service: ArithmeticService, image_input: str) -> int:
+    """识别并计算后关闭全局异步 HTTP 客户端"""
+    try:
+        return await service.arecognize_and_calculate(image_input)
+    finally:
+        await close_http_client()
+
+
+def test_arecognize_and_calculate_follows_redirect(image_server: str) -> None:
+    """异步识别应跟随图片 URL 的重定向，并在注入的线程池中执行识别"""
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="arith-test") as executor:
+        service = ArithmeticService(executor=executor)
+        stub = _StubOCR()
+        service._ocr = stub
+        
+        result = asyncio.run(_arecognize_and_close(service, f"{image_server}/redirect"))
+    
+    assert result == 8
+    assert stub.images == [IMAGE_BYTES]
+    assert stub.threads[0].startswith("arith-test")
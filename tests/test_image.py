@@ -0,0 +1,109 @@
+"""
+图片处理工具测试
+"""
+
+import asyncio
+import struct
+
+import cv2
+import numpy as np
+import pytest
+
+from src.exceptions import ImageDownloadError
+from src.utils import aget_image_content, close_http_client, get_image_content
+from src.utils.image import _peek_width
+from tests.conftest import IMAGE_BYTES
+
+
+# 测试图片尺寸（宽度取奇数，避免与高度混淆）
+_WIDTH = 123
+_HEIGHT = 45
+
+# 无法解析的 URL（在发送请求前即被 HTTP 客户端拒绝）
+_MALFORMED_URLS = [
+    "http://[::1/x",
+    "https://\x00bad/",
+]
+
+
+async def _aget_and_close(url: str) -> bytes:
+    """获取图片内容后关闭全局异步 HTTP 客户端"""
+    try:
+        return await aget_image_content(url)
+    finally:
+        await close_http_client()
+
+
+@pytest.mark.parametrize("url", _MALFORMED_URLS)
+def test_aget_image_content_rejects_malformed_url(url: str) -> None:
+    """异步下载遇到非法 URL 时应抛出 ImageDownloadError（400），而非未处理异常"""
+    with pytest.raises(ImageDownloadError) as exc_info:
+        asyncio.run(_aget_and_close(url))
+    
+    assert exc_info.value.code == 400
+
+
+@pytest.mark.parametrize("url", _MALFORMED_URLS)
+def test_get_image_content_rejects_malformed_url(url: str) -> None:
+    """同步下载遇到非法 URL 时应抛出 ImageDownloadError（400）"""
+    with pytest.raises(ImageDownloadError) as exc_info:
+        get_image_content(url)
+    
+    assert exc_info.value.code == 400
+
+
+def test_aget_image_content_follows_redirect(image_server: str) -> None:
+    """异步下载应跟随 302 重定向并返回目标图片内容"""
+    content = asyncio.run(_aget_and_close(f"{image_server}/redirect"))
+    
+    assert content == IMAGE_BYTES
+
+
+def test_get_image_content_follows_redirect(image_server: str) -> None:
+    """同步下载应跟随 302 重定向并返回目标图片内容"""
+    assert get_image_content(f"{image_server}/redirect") == IMAGE_BYTES
+
+
+def test_aget_image_content_decodes_data_uri() -> None:
+    """异步获取 Data URI 图片时应返回解码后的字节内容"""
+    content = asyncio.run(aget_image_content("data:image/png;base64,iVBORw0KGgo="))
+    
+    assert content == b"\x89PNG\r\n\x1a\n"
+
+
+def _encode(ext: str, *params: int) -> bytes:
+    """将固定尺寸的随机图片编码为指定格式"""
+    img = np.random.default_rng(0).integers(0, 256, (_HEIGHT, _WIDTH, 3), dtype=np.uint8)
+    ok, buf = cv2.imencode(ext, img, list(params))
+    assert ok
+    return buf.tobytes()
+
+
+def _with_large_app_segments(jpeg: bytes) -> bytes:
+    """在 SOI 之后插入两个满长度的 APPn 段（模拟 EXIF / ICC 配置文件）"""
+    payload = b"\x00" * (0xFFFF - 2)
+    segments = b"".join(
+        bytes([0xFF, marker]) + struct.pack(">H", 0xFFFF) + payload
+        for marker in (0xE1, 0xE2)
+    )
+    return jpeg[:2] + segments + jpeg[2:]
+
+
+_BASELINE_JPEG = _encode(".jpg")
+
+
+@pytest.mark.parametrize(
+    "image_bytes, expected",
+    [
+        pytest.param(_encode(".png"), _WIDTH, id="png"),
+        pytest.param(_BASELINE_JPEG, _WIDTH, id="baseline-jpeg"),
+        pytest.param(_encode(".jpg", cv2.IMWRITE_JPEG_PROGRESSIVE, 1), _WIDTH, id="progressive-jpeg"),
+        pytest.param(_with_large_app_segments(_BASELINE_JPEG), _WIDTH, id="large-appn-jpeg"),
+        pytest.param(_encode(".png")[:20], None, id="truncated-png"),
+        pytest.param(_with_large_app_segments(_BASELINE_JPEG)[:1024], None, id="truncated-jpeg"),
+        pytest.param(b"GIF89a" + b"\x00" * 32, None, id="unsupported"),
+    ],
+)
+def test_peek_width(image_bytes: bytes, expected: int) -> None:
+    """仅解析文件头即可读出 PNG / JPEG 宽度，文件头不完整或格式不支持时返回 None"""
+    assert _peek_width(image_bytes) == expected
@@ -0,0 +1,74 @@
+"""
+OpenCV 识别算法测试
+"""
+
+from typing import Tuple
+
+import cv2
+import numpy as np
+import pytest
+
+from src.core.opencv import _coarse_to_fine_match, _masked_match_x
+
+
+# 拼图块边长（像素）
+_PIECE = 50
+
+
+def _make_shaded_captcha(
+    rng: np.random.Generator,
+    size: Tuple[int, int] = (160, 340),
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    生成缺口带阴影的滑块验证码
+    
+    背景为平滑随机纹理，缺口区域按拼图形状加深阴影；
+    滑块图为带抗锯齿 Alpha 边缘的 BGRA 图片，透明像素为黑色。
+    
+    Args:
+        rng: 随机数生成器
+        size: 背景图尺寸（高, 宽）
+    
+    Returns:
+        (背景灰度图, 滑块图 BGRA, 缺口 X 坐标)
+    """
+    height, width = size
+    noise = rng.random((height // 8, width // 8, 3)).astype(np.float32)
+    bg = cv2.resize(noise, (width, height), interpolation=cv2.INTER_CUBIC)
+    bg = cv2.GaussianBlur(np.clip(bg * 255, 0, 255).astype(np.uint8), (5, 5), 0)
+    
+    x = int(rng.integers(_PIECE + 20, width - _PIECE - 5))
+    y = int(rng.integers(5, height - _PIECE - 5))
+    
+    # 拼图形状：方块 + 两个凸起，边缘抗锯齿
+    shape = np.zeros((_PIECE, _PIECE), np.uint8)
+    cv2.rectangle(shape, (8, 8), (_PIECE - 9, _PIECE - 9), 255, -1)
+    cv2.circle(shape, (_PIECE // 2, 6), 7, 255, -1)
+    cv2.circle(shape, (_PIECE - 7, _PIECE // 2), 7, 255, -1)
+    shape = cv2.GaussianBlur(shape, (3, 3), 0)
+    
+    slider = np.zeros((_PIECE, _PIECE, 4), np.uint8)
+    slider[..., :3] = bg[y:y + _PIECE, x:x + _PIECE]
+    slider[..., 3] = shape
+    slider[shape == 0, :3] = 0
+    
+    # 缺口阴影
+    alpha = (shape.astype(np.float32) / 255)[..., None]
+    region = bg[y:y + _PIECE, x:x + _PIECE].astype(np.float32)
+    region = region * (1 - 0.55 * alpha) + 0.55 * alpha * 40
+    bg[y:y + _PIECE, x:x + _PIECE] = np.clip(region, 0, 255).astype(np.uint8)
+    
+    return cv2.cvtColor(bg, cv2.COLOR_BGR2GRAY), slider, x
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_coarse_to_fine_matches_full_search_on_shaded_gap(seed: int) -> None:
+    """由粗到精匹配在阴影缺口上应与全图掩码匹配结果一致"""
+    img, slider, gap_x = _make_shaded_captcha(np.random.default_rng(seed))
+    tpl = cv2.cvtColor(slider, cv2.COLOR_BGRA2GRAY)
+    mask = np.where(slider[:, :, 3] > 0, np.uint8(255), np.uint8(0))
+    
+    full_x = _masked_match_x(img, tpl, mask)
+    
+    assert abs(full_x - gap_x) <= 1
+    assert _coarse_to_fine_match(img, tpl, mask) == full_x